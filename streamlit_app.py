@@ -1,76 +1,41 @@
 import streamlit as st
 import tempfile
+import logging
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from io import BytesIO
-from utils.loader import load_3d_model
-from analyzers.geometry import analyze_mesh
+from types import MappingProxyType
+from utils.reorder import reorder_for_locality
 import numpy as np
-import plotly.graph_objects as go
-import trimesh
-import open3d as o3d
+import atexit
 import csv
-import joblib
-
-# Initialize session state for mesh, tmp_path, and analysis
-if 'mesh' not in st.session_state:
-    st.session_state.mesh = None
-if 'tmp_path' not in st.session_state:
-    st.session_state.tmp_path = None
-if 'analysis' not in st.session_state:
-    st.session_state.analysis = None
-
-# --- Mesh Viewer Rendering Function ---
-def render_mesh_viewer():
-    mesh = st.session_state.mesh
-    MAX_DISPLAY_TRIANGLES = 100000
-    vertices_np = np.asarray(mesh.vertices)
-    triangles_np = np.asarray(mesh.triangles)
-
-    if len(triangles_np) > MAX_DISPLAY_TRIANGLES:
-        simplified_mesh = mesh.simplify_quadric_decimation(MAX_DISPLAY_TRIANGLES)
-        vertices_np = np.asarray(simplified_mesh.vertices)
-        triangles_np = np.asarray(simplified_mesh.triangles)
-
-    if len(triangles_np) > 100000:
-        simplified_mesh = mesh.simplify_quadric_decimation(50000)
-        vertices_np = np.asarray(simplified_mesh.vertices)
-        triangles_np = np.asarray(simplified_mesh.triangles)
-
-    trimesh_obj = trimesh.Trimesh(vertices=vertices_np, faces=triangles_np)
-
-    extension = st.session_state.tmp_path.split(".")[-1] if st.session_state.tmp_path else "ply"
-    glb_path = st.session_state.tmp_path.replace("." + extension, ".glb")
-    try:
-        trimesh_obj.export(glb_path)
-        if not os.path.exists(glb_path):
-            st.error("Failed to export mesh to GLB.")
-            return
-        fig = go.Figure(data=[go.Mesh3d(
-            x=vertices_np[:, 0],
-            y=vertices_np[:, 1],
-            z=vertices_np[:, 2],
-            i=triangles_np[:, 0],
-            j=triangles_np[:, 1],
-            k=triangles_np[:, 2],
-            color='gray',
-            opacity=1.0,
-            lighting=dict(ambient=0.18, diffuse=1, fresnel=0.1, specular=0.3, roughness=0.7),
-            lightposition=dict(x=100, y=200, z=0)
-        )])
-        fig.update_layout(
-            scene=dict(aspectmode='data'),
-            margin=dict(r=0, l=0, b=0, t=0),
-            autosize=True,
-            width=None,
-            height=600
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    except Exception as e:
-        st.error(f"An error occurred while rendering the 3D preview: {e}")
-
-st.set_page_config(page_title="Scanalyzer", layout="wide")
-st.markdown("""
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Debug output goes through logging so it costs nothing at the default level;
+# set SCANALYZER_LOG=DEBUG to see the per-rerun load diagnostics.
+log = logging.getLogger("scanalyzer")
+log.setLevel(os.environ.get("SCANALYZER_LOG", "INFO"))
+
+# plotly, trimesh, and joblib are heavyweight imports; they are pulled in
+# lazily inside the functions that need them so the landing page paints
+# before any mesh work happens. The same goes for utils.loader and
+# analyzers.geometry, which drag in open3d (~half a second of pybind11
+# registration) and are only needed once a file has been uploaded.
+
+try:
+    import pyfqmr
+except ImportError:
+    pyfqmr = None
+
+_CSS = """
     <style>
     html, body, [class*="css"]  {
         font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
@@ -145,7 +110,334 @@ st.markdown("""
         color: transparent;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Simplification log: directory creation and field order are fixed for the
+# process lifetime, and each click costs a single buffered append.
+CSV_LOG_PATH = "data/simplification_logs.csv"
+CSV_FIELDNAMES = (
+    "mesh_name", "vertices", "triangles", "surface_area", "volume", "watertight",
+    "average_edge_length", "average_triangle_aspect_ratio", "min_curvature",
+    "average_curvature", "max_curvature", "connected_components",
+    "approx_thickness", "simplification_level"
+)
+Path("data").mkdir(exist_ok=True)
+
+@st.cache_resource(show_spinner=False)
+def _csv_log():
+    # One append-only handle for the process lifetime; cache_resource shares
+    # it across reruns and sessions instead of reopening the file per click,
+    # and atexit flushes whatever the 64 KB buffer still holds on shutdown.
+    f = open(CSV_LOG_PATH, "a", buffering=1 << 16, newline="")
+    atexit.register(f.close)
+    return f, csv.writer(f)
+
+# Simplification-suggestion model: feature order is fixed by training and the
+# pickle is parsed once per process. The single-row feature array is built
+# per prediction — sessions share this process, so a module-level buffer
+# would race between concurrent script threads.
+MODEL_PATH = "model/simplification_model.pkl"
+FEATURE_ORDER = (
+    "average_edge_length", "min_curvature", "average_triangle_aspect_ratio",
+    "average_curvature", "surface_area", "volume", "connected_components",
+    "triangles", "max_curvature", "vertices", "approx_thickness", "watertight"
+)
+
+@st.cache_resource(show_spinner=False)
+def _load_model(path):
+    import joblib
+    return joblib.load(path)
+
+# Initialize session state for mesh, tmp_path, and analysis
+if 'mesh' not in st.session_state:
+    st.session_state.mesh = None
+if 'tmp_path' not in st.session_state:
+    st.session_state.tmp_path = None
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = None
+# Revision counters: mesh_rev bumps whenever the mesh object changes (load or
+# simplify); analyzed_rev records the last revision that was analyzed.
+st.session_state.setdefault("mesh_rev", 0)
+st.session_state.setdefault("analyzed_rev", -1)
+
+MAX_DISPLAY_TRIANGLES = 100000
+
+# Tooltip texts for the summary expander, frozen at module scope so the
+# per-rerun code only formats values instead of rebuilding the strings.
+_METRIC_HELP = MappingProxyType({
+    "Vertices": "Points in 3D space used to define the geometry of the mesh",
+    "Triangles": "Mesh faces composed of three vertices each, defining the surface",
+    "Surface Area": "Total area covered by all triangles on the mesh surface",
+    "Volume": "3D space enclosed by the mesh; only available if watertight",
+    "Approx. Thickness": "Smallest bounding box side; useful to gauge wall or part thinness",
+    "Watertight": "True if the mesh forms a sealed, manifold shape without holes",
+    "Avg. Edge Length": "Average distance between connected vertex pairs in the mesh",
+    "Aspect Ratio": "Quality measure of triangle shapes; ideal triangles have low ratios",
+    "Connected Components": "Counts how many isolated pieces the mesh is made of",
+    "Curvature (min/avg/max)": "Statistical description of how curved the surface is",
+})
+
+def _metric_line(label, value):
+    return f"- **{label}** <span title='{_METRIC_HELP[label]}'>❓</span>: {value}"
+
+# Static Plotly viewer settings, built once instead of per rerun.
+_MESH3D_LIGHTING = dict(ambient=0.18, diffuse=1, fresnel=0.1, specular=0.3, roughness=0.7)
+_MESH3D_LIGHTPOSITION = dict(x=100, y=200, z=0)
+_MESH3D_LAYOUT = dict(
+    scene=dict(aspectmode='data'),
+    margin=dict(r=0, l=0, b=0, t=0),
+    autosize=True,
+    width=None,
+    height=600
+)
+
+def _np_view(mesh):
+    # Open3D copies its C++ vectors through pybind11 on every np.asarray call,
+    # so materialize (vertices, triangles) once per mesh revision. Keyed on
+    # the object id; a new mesh evicts the stale entry.
+    cache = st.session_state.setdefault("_np_cache", {})
+    key = id(mesh)
+    if key not in cache:
+        cache.clear()
+        cache[key] = (np.asarray(mesh.vertices), np.asarray(mesh.triangles))
+    return cache[key]
+
+def _approx_thickness(mesh):
+    # Smallest bounding-box side, from the cached vertex array in one SIMD
+    # sweep; Open3D's legacy mesh has no .bounds and would need a fresh C++
+    # pass per axis anyway.
+    vertices_np = _np_view(mesh)[0]
+    return float(np.ptp(vertices_np, axis=0).min()) if vertices_np.size else 0.0
+
+def _mesh_digest(mesh):
+    # Content hash of the mesh buffers; used as the cache key for the viewer
+    # and analysis helpers so Streamlit reruns with an unchanged mesh skip all
+    # the work. Hashing itself is O(mesh bytes), so the digest is memoized per
+    # mesh object the same way _np_view memoizes the array conversion.
+    cache = st.session_state.setdefault("_digest_cache", {})
+    key = id(mesh)
+    if key not in cache:
+        vertices_np, triangles_np = _np_view(mesh)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.ascontiguousarray(vertices_np))
+        h.update(np.ascontiguousarray(triangles_np))
+        cache.clear()
+        cache[key] = h.hexdigest()
+    return cache[key]
+
+@st.cache_resource(show_spinner=False, ttl=24 * 60 * 60)
+def _display_arrays(mesh_digest):
+    # Decimate the mesh for display once per mesh revision.
+    mesh = st.session_state.mesh
+    vertices_np, triangles_np = _np_view(mesh)
+
+    if len(triangles_np) > MAX_DISPLAY_TRIANGLES:
+        if pyfqmr is not None:
+            # pyfqmr (Fast-Quadric-Mesh-Simplification binding) decimates
+            # roughly an order of magnitude faster than Open3D.
+            simplifier = pyfqmr.Simplify()
+            simplifier.setMesh(vertices_np, triangles_np)
+            simplifier.simplify_mesh(
+                target_count=MAX_DISPLAY_TRIANGLES,
+                aggressiveness=7,
+                preserve_border=True,
+            )
+            vertices_np, triangles_np, _ = simplifier.getMesh()
+        else:
+            simplified_mesh = mesh.simplify_quadric_decimation(MAX_DISPLAY_TRIANGLES)
+            vertices_np = np.asarray(simplified_mesh.vertices)
+            triangles_np = np.asarray(simplified_mesh.triangles)
+
+    # Spatially sorted triangle indices render with far fewer GPU
+    # vertex-cache misses; one argsort per mesh revision, then cached.
+    triangles_np = reorder_for_locality(vertices_np, triangles_np)
+
+    return vertices_np, triangles_np
+
+@st.cache_resource(show_spinner=False, ttl=24 * 60 * 60)
+def _build_mesh_figure(mesh_digest):
+    import plotly.graph_objects as go
+
+    vertices_np, triangles_np = _display_arrays(mesh_digest)
+    # float32 coordinates / uint32 indices halve the bytes Plotly serializes
+    # over the websocket and keep it on its typed numpy fast path.
+    vertices_np = np.ascontiguousarray(vertices_np, dtype=np.float32)
+    triangles_np = np.ascontiguousarray(triangles_np, dtype=np.uint32)
+    # Column slices of a 2D array are strided views; copying each one to a
+    # contiguous buffer keeps Plotly on its typed-array serialization path
+    # instead of per-element Python iteration.
+    fig = go.Figure(data=[go.Mesh3d(
+        x=np.ascontiguousarray(vertices_np[:, 0]),
+        y=np.ascontiguousarray(vertices_np[:, 1]),
+        z=np.ascontiguousarray(vertices_np[:, 2]),
+        i=np.ascontiguousarray(triangles_np[:, 0]),
+        j=np.ascontiguousarray(triangles_np[:, 1]),
+        k=np.ascontiguousarray(triangles_np[:, 2]),
+        color='gray',
+        opacity=1.0,
+        lighting=_MESH3D_LIGHTING,
+        lightposition=_MESH3D_LIGHTPOSITION
+    )])
+    fig.update_layout(**_MESH3D_LAYOUT)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _insights_figure(min_curv, avg_curv, max_curv, vertices, triangles,
+                     sharp_edges, thickness):
+    # Keyed on the plotted scalars, so an unchanged analysis reuses the built
+    # figure instead of reconstructing and re-serializing it every rerun.
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=1, cols=2, subplot_titles=("Curvature Overview", "Basic Geometry Overview")
+    )
+    # Typed arrays instead of Python lists keep Plotly's serializer on its
+    # numpy fast path rather than boxing each scalar.
+    fig.add_bar(
+        name="Curvature", x=["Min", "Average", "Max"],
+        y=np.fromiter((min_curv, avg_curv, max_curv), dtype=np.float32, count=3),
+        row=1, col=1
+    )
+    fig.add_bar(
+        name="Geometry", x=["Vertices", "Triangles", "Sharp Edges", "Approx. Thickness"],
+        y=np.fromiter((vertices, triangles, sharp_edges, thickness), dtype=np.float64, count=4),
+        row=1, col=2
+    )
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', showlegend=False)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _analysis_df(analysis_items):
+    # The dict-of-scalars previously handed to st.dataframe was re-converted
+    # to a DataFrame and Arrow-encoded on every rerun; caching on the value
+    # tuple makes an unchanged analysis a hash lookup.
+    import pandas as pd
+    return pd.DataFrame(list(analysis_items), columns=["Metric", "Value"])
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _glb_bytes(mesh_digest):
+    # Opt-in GLB export; serialized once per mesh revision and kept as bytes
+    # (max_entries caps the RAM held by large exports).
+    # process=False skips trimesh's vertex-merge/validation pipeline; the
+    # arrays come from a mesh that was already cleaned on load or simplify.
+    import trimesh
+    vertices_np, triangles_np = _np_view(st.session_state.mesh)
+    return trimesh.Trimesh(
+        vertices=vertices_np, faces=triangles_np, process=False
+    ).export(file_type="glb")
+
+@st.cache_resource(show_spinner=False)
+def _executor():
+    # One pool per process (cache_resource), not one per script rerun.
+    return ThreadPoolExecutor(max_workers=2)
+
+def _simplify_pipeline(mesh, factor):
+    # Cleanup, decimation, and normal recomputation in one unit so the whole
+    # chain runs off Streamlit's script thread; Open3D releases the GIL for
+    # its C++ bodies, so the UI stays responsive while this works.
+    import open3d as o3d
+
+    # Work on a copy: the input is the object held by _cached_load's shared
+    # cache, and the cleanup calls below mutate in place — without the copy
+    # the first simplify would permanently alter the cached original for
+    # every session that uploads the same file.
+    mesh = o3d.geometry.TriangleMesh(mesh)
+    mesh.remove_duplicated_vertices()
+    mesh.remove_degenerate_triangles()
+    target_triangles = max(100, int(len(mesh.triangles) * factor))
+    mesh = mesh.simplify_quadric_decimation(target_triangles)
+    mesh.compute_vertex_normals()
+    return mesh
+
+@st.cache_resource(show_spinner=False)
+def _cached_load(path, mtime, size):
+    # cache_resource rather than cache_data: TriangleMesh is unpicklable.
+    # mtime/size participate in the key so a rewritten temp file reloads.
+    from utils.loader import load_3d_model
+    return load_3d_model(path)
+
+# On-disk analysis cache: entries are small JSON dicts keyed by the mesh
+# content digest, so re-uploading a known mesh (or restarting the server)
+# skips the full analysis, not just the in-memory st.cache_data layer.
+_ANALYSIS_CACHE_DIR = Path.home() / ".cache" / "scanalyzer"
+_ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+@st.cache_data(show_spinner=False)
+def _cached_analyze(mesh_digest):
+    cache_path = _ANALYSIS_CACHE_DIR / f"{mesh_digest}.json"
+    if cache_path.is_file():
+        try:
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read()) if orjson is not None else json.load(f)
+        except (ValueError, OSError):
+            pass  # corrupt or partial entry; recompute and rewrite below
+    # Run on the worker pool (same as _simplify_pipeline): Open3D releases
+    # the GIL inside its C++ bodies, so other sessions on this server keep
+    # being served while a large mesh is analyzed.
+    from analyzers.geometry import analyze_mesh
+    analysis = _executor().submit(analyze_mesh, st.session_state.mesh).result()
+    try:
+        with open(cache_path, "wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(analysis))
+            else:
+                f.write(json.dumps(analysis).encode())
+    except OSError:
+        pass  # cache dir unwritable; analysis still returned
+    return analysis
+
+@st.fragment
+def _downloads_fragment():
+    # st.fragment scopes reruns: ticking the GLB checkbox or clicking a
+    # download button re-executes only this block, not the whole script.
+    # Serialize the report once per analysis object; reruns reuse the
+    # cached bytes (orjson when available, stdlib json otherwise).
+    if st.session_state.get("_report_id") != id(st.session_state.analysis):
+        if orjson is not None:
+            # OPT_SERIALIZE_NUMPY handles np.float64/np.int64 scalars
+            # from the analysis natively, with no custom encoder.
+            report_bytes = orjson.dumps(
+                st.session_state.analysis,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        else:
+            report_bytes = json.dumps(st.session_state.analysis, indent=2)
+        st.session_state._report_bytes = report_bytes
+        st.session_state._report_id = id(st.session_state.analysis)
+    st.markdown("<div style='text-align: center;'>", unsafe_allow_html=True)
+    st.download_button(
+        label="Download Report as JSON",
+        data=st.session_state._report_bytes,
+        file_name="scanalyzer_report.json",
+        mime="application/json"
+    )
+    # GLB export is opt-in: serialization costs a full pass over the
+    # mesh, so it only happens when the checkbox is ticked, and the
+    # bytes are cached against the content digest.
+    if st.checkbox("Export mesh as GLB"):
+        st.download_button(
+            label="Download Mesh as GLB",
+            data=_glb_bytes(_mesh_digest(st.session_state.mesh)),
+            file_name=f"{st.session_state.mesh_name}.glb",
+            mime="model/gltf-binary"
+        )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# --- Mesh Viewer Rendering Function ---
+def render_mesh_viewer():
+    # The Plotly viewer consumes the numpy arrays directly; no GLB export is
+    # needed on this path.
+    mesh_digest = _mesh_digest(st.session_state.mesh)
+    try:
+        st.plotly_chart(_build_mesh_figure(mesh_digest), use_container_width=True)
+    except Exception as e:
+        st.error(f"An error occurred while rendering the 3D preview: {e}")
+
+st.set_page_config(page_title="Scanalyzer", layout="wide")
+# Emitted every run: Streamlit drops elements that aren't re-emitted during a
+# rerun, so gating this behind a session flag would strip the styling on the
+# first interaction. The win is the hoisted constant, not a one-shot send.
+st.markdown(_CSS, unsafe_allow_html=True)
 st.title("Scanalyzer: Upload, Analyze & Simplify 3D Meshes")
 
 col_left, col_right = st.columns([1, 1])
@@ -183,70 +475,105 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
         if not ('tmp_path' in locals() and tmp_path is not None):
             tmp_path = "examples/bunny.ply"
     elif uploaded_file is not None:
-        with tempfile.NamedTemporaryFile(delete=False, suffix="." + uploaded_file.name.split(".")[-1]) as tmp:
-            tmp.write(uploaded_file.read())
-            tmp_path = tmp.name
-
-    print("Trying to load mesh from:", tmp_path)
-    print(f"Mesh loaded from: {tmp_path}")
-    print(f"File exists? {os.path.exists(tmp_path)}")
-    print(f"File size: {os.path.getsize(tmp_path)} bytes")
+        # Content-addressed temp file: most reruns (slider moves, checkbox
+        # flips) carry the same upload bytes, so hashing them and reusing the
+        # existing scanalyzer_<hash> file skips the rewrite — and keeps the
+        # path/mtime stable so _cached_load stays a cache hit. Both the hash
+        # and the write stream the upload in 4 MB chunks so peak memory stays
+        # bounded regardless of file size.
+        hasher = hashlib.blake2b(digest_size=8)
+        uploaded_file.seek(0)
+        while chunk := uploaded_file.read(4_194_304):
+            hasher.update(chunk)
+        upload_hash = hasher.hexdigest()
+        ext = os.path.splitext(uploaded_file.name)[1]
+        tmp_path = str(Path(tempfile.gettempdir()) / f"scanalyzer_{upload_hash}{ext}")
+        if not os.path.exists(tmp_path):
+            # Write to a unique sibling and os.replace it into place: the
+            # rename is atomic, so an existing content-addressed path always
+            # holds a complete file — even with several sessions uploading
+            # the same bytes at once, or a process killed mid-write.
+            fd, part_path = tempfile.mkstemp(
+                dir=tempfile.gettempdir(), suffix=".part"
+            )
+            try:
+                uploaded_file.seek(0)
+                with os.fdopen(fd, "wb") as tmp:
+                    shutil.copyfileobj(uploaded_file, tmp, length=4_194_304)
+                os.replace(part_path, tmp_path)
+            except Exception:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "mesh load: path=%s exists=%s size=%s",
+            tmp_path, os.path.exists(tmp_path),
+            os.path.getsize(tmp_path) if os.path.exists(tmp_path) else "n/a",
+        )
     try:
-        st.session_state.mesh = load_3d_model(tmp_path)
+        loaded_mesh = _cached_load(
+            tmp_path, os.path.getmtime(tmp_path), os.path.getsize(tmp_path)
+        )
+        if loaded_mesh is not st.session_state.mesh:
+            st.session_state.mesh_rev += 1
+        st.session_state.mesh = loaded_mesh
         st.session_state.tmp_path = tmp_path
+        st.session_state.mesh_name = Path(tmp_path).stem
     except Exception as e:
         st.warning(f"Mesh failed to load: {e}")
         st.session_state.mesh = None
-    print("Mesh loaded?", st.session_state.mesh is not None)
-    if st.session_state.mesh:
-        print("Vertices:", len(st.session_state.mesh.vertices))
-        print("Triangles:", len(st.session_state.mesh.triangles))
-    if st.session_state.mesh is None or len(st.session_state.mesh.vertices) == 0 or len(st.session_state.mesh.triangles) == 0:
+    log.debug("mesh loaded? %s", st.session_state.mesh is not None)
+    # Bind the numpy views once; every mesh.vertices/mesh.triangles touch goes
+    # through pybind11, so the emptiness checks and fallback dict below reuse
+    # these arrays instead of re-crossing the boundary.
+    if st.session_state.mesh is not None:
+        vertices_np, triangles_np = _np_view(st.session_state.mesh)
+        log.debug("vertices=%d triangles=%d", len(vertices_np), len(triangles_np))
+    if st.session_state.mesh is None or len(vertices_np) == 0 or len(triangles_np) == 0:
         st.warning("Model could not be loaded or contains no geometry. Please try another mesh.")
     else:
-        with st.spinner("Analyzing mesh..."):
-            try:
-                st.session_state.analysis = analyze_mesh(st.session_state.mesh)
-                from analyzers.geometry import log_analysis_results
-                from os.path import basename
-                mesh_name = basename(st.session_state.tmp_path).split('.')[0]
-                log_analysis_results(st.session_state.analysis, mesh_name)
-            except RuntimeError as e:
-                st.warning("Analysis warning: " + str(e))
-                st.session_state.analysis = {
-                    "vertices": len(st.session_state.mesh.vertices),
-                    "triangles": len(st.session_state.mesh.triangles),
-                    "surface_area": st.session_state.mesh.get_surface_area() if st.session_state.mesh.get_surface_area() is not None else 0.0,
-                    "volume": st.session_state.mesh.get_volume() if st.session_state.mesh.is_watertight() else 0.0,
-                    "watertight": st.session_state.mesh.is_watertight(),
-                    "average_edge_length": 0.0,
-                    "average_triangle_aspect_ratio": 0.0,
-                    "connected_components": 0,
-                    "min_curvature": 0.0,
-                    "average_curvature": 0.0,
-                    "max_curvature": 0.0
-                }
+        # Re-analyze (and re-log) only when the mesh actually changed; any
+        # unrelated widget interaction reruns this script top to bottom.
+        if st.session_state.analyzed_rev != st.session_state.mesh_rev:
+            with st.spinner("Analyzing mesh..."):
+                try:
+                    from analyzers.geometry import log_analysis_results
+                    st.session_state.analysis = _cached_analyze(_mesh_digest(st.session_state.mesh))
+                    log_analysis_results(st.session_state.analysis, st.session_state.mesh_name)
+                except RuntimeError as e:
+                    st.warning("Analysis warning: " + str(e))
+                    is_watertight = st.session_state.mesh.is_watertight()
+                    st.session_state.analysis = {
+                        "vertices": len(vertices_np),
+                        "triangles": len(triangles_np),
+                        "surface_area": st.session_state.mesh.get_surface_area(),
+                        "volume": st.session_state.mesh.get_volume() if is_watertight else 0.0,
+                        "watertight": is_watertight,
+                        "average_edge_length": 0.0,
+                        "average_triangle_aspect_ratio": 0.0,
+                        "connected_components": 0,
+                        "min_curvature": 0.0,
+                        "average_curvature": 0.0,
+                        "max_curvature": 0.0
+                    }
 
-        try:
-            bounds = st.session_state.mesh.bounds
-            min_dim = np.min(bounds[1] - bounds[0])
-            st.session_state.analysis["approx_thickness"] = float(min_dim)
-        except:
-            st.session_state.analysis["approx_thickness"] = 0.0
+            st.session_state.analysis["approx_thickness"] = _approx_thickness(st.session_state.mesh)
+            st.session_state.analyzed_rev = st.session_state.mesh_rev
 
         # ML-based suggestion for simplification level
         suggested_level = None
-        model_path = "model/simplification_model.pkl"
 
-        if os.path.exists(model_path):
+        if os.path.exists(MODEL_PATH):
             try:
-                model = joblib.load(model_path)
-                feature_order = [
-                    "average_edge_length", "min_curvature", "average_triangle_aspect_ratio",
-                    "average_curvature", "surface_area", "volume", "connected_components",
-                    "triangles", "max_curvature", "vertices", "approx_thickness", "watertight"
-                ]
-                features = [[st.session_state.analysis.get(k, 0.0) for k in feature_order]]
+                model = _load_model(MODEL_PATH)
+                # Handing scikit-learn a typed 2D array skips the
+                # list-of-lists conversion in check_array on every prediction.
+                features = np.fromiter(
+                    (st.session_state.analysis.get(k) or 0.0 for k in FEATURE_ORDER),
+                    dtype=np.float32, count=len(FEATURE_ORDER)
+                ).reshape(1, -1)
                 suggested_level = model.predict(features)[0]
             except Exception as e:
                 st.warning(f"Model prediction failed: {e}")
@@ -256,21 +583,35 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
 
             with st.expander("Mesh Analysis Summary"):
                 analysis = st.session_state.analysis
+                # One markdown payload per column: each st.markdown call is
+                # its own delta message to the browser, so joining the lines
+                # sends two messages instead of twelve with identical output.
                 cols = st.columns(2)
                 with cols[0]:
-                    st.markdown("**Mesh Structure**")
-                    st.markdown(f"- **Vertices** <span title='Points in 3D space used to define the geometry of the mesh'>❓</span>: {analysis.get('vertices', 0)}", unsafe_allow_html=True)
-                    st.markdown(f"- **Triangles** <span title='Mesh faces composed of three vertices each, defining the surface'>❓</span>: {analysis.get('triangles', 0)}", unsafe_allow_html=True)
-                    st.markdown(f"- **Surface Area** <span title='Total area covered by all triangles on the mesh surface'>❓</span>: {analysis.get('surface_area') or 0.0:.2f}", unsafe_allow_html=True)
-                    st.markdown(f"- **Volume** <span title='3D space enclosed by the mesh; only available if watertight'>❓</span>: {analysis.get('volume') or 0.0:.2f}", unsafe_allow_html=True)
-                    st.markdown(f"- **Approx. Thickness** <span title='Smallest bounding box side; useful to gauge wall or part thinness'>❓</span>: {analysis.get('approx_thickness', 0.0):.2f}", unsafe_allow_html=True)
+                    st.markdown(
+                        "**Mesh Structure**\n" + "\n".join((
+                            _metric_line("Vertices", analysis.get('vertices', 0)),
+                            _metric_line("Triangles", analysis.get('triangles', 0)),
+                            _metric_line("Surface Area", f"{analysis.get('surface_area') or 0.0:.2f}"),
+                            _metric_line("Volume", f"{analysis.get('volume') or 0.0:.2f}"),
+                            _metric_line("Approx. Thickness", f"{analysis.get('approx_thickness', 0.0):.2f}"),
+                        )),
+                        unsafe_allow_html=True,
+                    )
                 with cols[1]:
-                    st.markdown("**Topology & Quality**")
-                    st.markdown(f"- **Watertight** <span title='True if the mesh forms a sealed, manifold shape without holes'>❓</span>: {analysis.get('watertight', False)}", unsafe_allow_html=True)
-                    st.markdown(f"- **Avg. Edge Length** <span title='Average distance between connected vertex pairs in the mesh'>❓</span>: {analysis.get('average_edge_length', 0.0):.3f}", unsafe_allow_html=True)
-                    st.markdown(f"- **Aspect Ratio** <span title='Quality measure of triangle shapes; ideal triangles have low ratios'>❓</span>: {analysis.get('average_triangle_aspect_ratio', 0.0):.2f}", unsafe_allow_html=True)
-                    st.markdown(f"- **Connected Components** <span title='Counts how many isolated pieces the mesh is made of'>❓</span>: {analysis.get('connected_components', 0)}", unsafe_allow_html=True)
-                    st.markdown(f"- **Curvature (min/avg/max)** <span title='Statistical description of how curved the surface is'>❓</span>: {analysis.get('min_curvature', 0.0):.3f} / {analysis.get('average_curvature', 0.0):.3f} / {analysis.get('max_curvature', 0.0):.3f}", unsafe_allow_html=True)
+                    st.markdown(
+                        "**Topology & Quality**\n" + "\n".join((
+                            _metric_line("Watertight", analysis.get('watertight', False)),
+                            _metric_line("Avg. Edge Length", f"{analysis.get('average_edge_length', 0.0):.3f}"),
+                            _metric_line("Aspect Ratio", f"{analysis.get('average_triangle_aspect_ratio', 0.0):.2f}"),
+                            _metric_line("Connected Components", analysis.get('connected_components', 0)),
+                            _metric_line(
+                                "Curvature (min/avg/max)",
+                                f"{analysis.get('min_curvature', 0.0):.3f} / {analysis.get('average_curvature', 0.0):.3f} / {analysis.get('max_curvature', 0.0):.3f}",
+                            ),
+                        )),
+                        unsafe_allow_html=True,
+                    )
 
         with col_right:
             if st.session_state.mesh:
@@ -282,42 +623,33 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
 
             with st.expander("📊 Mesh Insights"):
                 analysis = st.session_state.analysis
-                tabs = st.tabs(["Curvature", "Geometry", "Analysis Table"])
+                tabs = st.tabs(["Overview", "Analysis Table"])
                 with tabs[0]:
-                    fig_curvature = go.Figure(data=[
-                        go.Bar(name="Curvature", x=["Min", "Average", "Max"], y=[
-                            analysis["min_curvature"],
-                            analysis["average_curvature"],
-                            analysis["max_curvature"]
-                        ])
-                    ])
-                    fig_curvature.update_layout(title="Curvature Overview", plot_bgcolor='white', paper_bgcolor='white')
-                    st.plotly_chart(fig_curvature)
+                    # One subplot figure means one websocket payload and one
+                    # Plotly.js mount instead of two.
+                    fig_insights = _insights_figure(
+                        analysis["min_curvature"],
+                        analysis["average_curvature"],
+                        analysis["max_curvature"],
+                        analysis["vertices"],
+                        analysis["triangles"],
+                        analysis.get("sharp_edge_count", 0),
+                        analysis.get("approx_thickness", 0.0),
+                    )
+                    st.plotly_chart(fig_insights, use_container_width=True)
 
                 with tabs[1]:
-                    fig_geometry = go.Figure(data=[
-                        go.Bar(name="Geometry", x=["Vertices", "Triangles", "Sharp Edges", "Approx. Thickness"], y=[
-                            analysis["vertices"],
-                            analysis["triangles"],
-                            analysis["sharp_edge_count"],
-                            analysis.get("approx_thickness", 0.0)
-                        ])
-                    ])
-                    fig_geometry.update_layout(title="Basic Geometry Overview", plot_bgcolor='white', paper_bgcolor='white')
-                    st.plotly_chart(fig_geometry)
-
-                with tabs[2]:
-                    simplified_table = {
-                        "Vertices": analysis["vertices"],
-                        "Triangles": analysis["triangles"],
-                        "Surface Area": analysis["surface_area"],
-                        "Volume": analysis["volume"],
-                        "Watertight": analysis["watertight"],
-                        "Average Edge Length": analysis["average_edge_length"],
-                        "Avg Triangle Aspect Ratio": analysis["average_triangle_aspect_ratio"],
-                        "Connected Components": analysis["connected_components"]
-                    }
-                    st.dataframe(simplified_table, use_container_width=False, width=500, height=300)
+                    simplified_table = (
+                        ("Vertices", analysis["vertices"]),
+                        ("Triangles", analysis["triangles"]),
+                        ("Surface Area", analysis["surface_area"]),
+                        ("Volume", analysis["volume"]),
+                        ("Watertight", analysis["watertight"]),
+                        ("Average Edge Length", analysis["average_edge_length"]),
+                        ("Avg Triangle Aspect Ratio", analysis["average_triangle_aspect_ratio"]),
+                        ("Connected Components", analysis["connected_components"])
+                    )
+                    st.dataframe(_analysis_df(simplified_table), use_container_width=False, width=500, height=300)
 
             # Mesh simplification controls
             simpl_col1, simpl_col2 = st.columns([3,1])
@@ -357,40 +689,27 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
                 else:
                     factor = 0.25
 
-                # Step 1: Remove duplicated vertices and degenerate triangles
-                mesh.remove_duplicated_vertices()
-                mesh.remove_degenerate_triangles()
-
-                # Step 2: Simplify mesh using quadric decimation
-                target_triangles = max(100, int(len(mesh.triangles) * factor))
-                mesh = mesh.simplify_quadric_decimation(target_triangles)
-
-                # Step 3: Recompute normals
-                mesh.compute_vertex_normals()
+                # Run cleanup + decimation + normals on the worker pool
+                future = _executor().submit(_simplify_pipeline, mesh, factor)
+                with st.spinner(f"Applying {level} simplification..."):
+                    mesh = future.result()
 
                 st.success(f"{level} simplification applied.")
 
-                # Store repaired mesh as trimesh for export
-                repaired_trimesh_obj = trimesh.Trimesh(
-                    vertices=np.asarray(mesh.vertices),
-                    faces=np.asarray(mesh.triangles)
-                )
-
                 # Re-run analysis
                 try:
+                    from analyzers.geometry import analyze_mesh, log_analysis_results
                     analysis = analyze_mesh(mesh)
-                    from analyzers.geometry import log_analysis_results
-                    from os.path import basename
-                    mesh_name = basename(tmp_path).split('.')[0]
-                    log_analysis_results(analysis, mesh_name)
+                    log_analysis_results(analysis, st.session_state.mesh_name)
                 except RuntimeError as e:
                     st.warning("Analysis warning: " + str(e))
+                    is_watertight = mesh.is_watertight()
                     analysis = {
                         "vertices": len(mesh.vertices),
                         "triangles": len(mesh.triangles),
-                        "surface_area": mesh.get_surface_area() if mesh.get_surface_area() is not None else 0.0,
-                        "volume": mesh.get_volume() if mesh.is_watertight() else 0.0,
-                        "watertight": mesh.is_watertight(),
+                        "surface_area": mesh.get_surface_area(),
+                        "volume": mesh.get_volume() if is_watertight else 0.0,
+                        "watertight": is_watertight,
                         "average_edge_length": 0.0,
                         "average_triangle_aspect_ratio": 0.0,
                         "connected_components": 0,
@@ -398,31 +717,21 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
                         "average_curvature": 0.0,
                         "max_curvature": 0.0
                     }
-                try:
-                    bounds = mesh.bounds
-                    min_dim = np.min(bounds[1] - bounds[0])
-                    analysis["approx_thickness"] = float(min_dim)
-                except:
-                    analysis["approx_thickness"] = 0.0
+                analysis["approx_thickness"] = _approx_thickness(mesh)
 
-                # Save back to session state for persistence
+                # Save back to session state for persistence; the handler has
+                # already analyzed the new mesh, so mark the revision done.
                 st.session_state.mesh = mesh
                 st.session_state.analysis = analysis
+                st.session_state.mesh_rev += 1
+                st.session_state.analyzed_rev = st.session_state.mesh_rev
 
                 # --- Render mesh viewer with updated mesh ---
                 render_mesh_viewer()
 
                 # Log mesh simplification results to CSV
-                csv_path = "data/simplification_logs.csv"
-                os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-                fieldnames = [
-                    "mesh_name", "vertices", "triangles", "surface_area", "volume", "watertight",
-                    "average_edge_length", "average_triangle_aspect_ratio", "min_curvature",
-                    "average_curvature", "max_curvature", "connected_components",
-                    "approx_thickness", "simplification_level"
-                ]
                 row = {
-                    "mesh_name": mesh_name,
+                    "mesh_name": st.session_state.mesh_name,
                     "vertices": analysis["vertices"],
                     "triangles": analysis["triangles"],
                     "surface_area": analysis["surface_area"],
@@ -437,22 +746,18 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
                     "approx_thickness": analysis["approx_thickness"],
                     "simplification_level": level
                 }
-                write_header = not os.path.exists(csv_path)
-                with open(csv_path, mode="a", newline="") as file:
-                    writer = csv.DictWriter(file, fieldnames=fieldnames)
-                    if write_header:
-                        writer.writeheader()
-                    writer.writerow(row)
+                csv_file, csv_writer = _csv_log()
+                # The handle is shared process-wide and opened in append mode,
+                # so its position is the file size: a header is due only when
+                # the file is still empty, regardless of which session writes.
+                if csv_file.tell() == 0:
+                    csv_writer.writerow(CSV_FIELDNAMES)
+                csv_writer.writerow([row[k] for k in CSV_FIELDNAMES])
+                # One flush per click keeps rows durable without reopening.
+                csv_file.flush()
 
             # Download button block moved below mesh simplification controls
-            st.markdown("<div style='text-align: center;'>", unsafe_allow_html=True)
-            st.download_button(
-                label="Download Report as JSON",
-                data=__import__('json').dumps(st.session_state.analysis, indent=2),
-                file_name="scanalyzer_report.json",
-                mime="application/json"
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
+            _downloads_fragment()
 
         st.markdown("---")
         st.markdown(
@@ -464,14 +769,18 @@ if uploaded_file is not None or ('tmp_path' in locals() and tmp_path is not None
         )
 
         # Cleanup
-        print(f"Temp path: {st.session_state.tmp_path}")
-        if 'glb_path' in locals() and os.path.exists(glb_path):
-            print(f"GLB path: {glb_path}")
-            print(f"GLB exists? {os.path.exists(glb_path)}")
-            import shutil
-            shutil.copy(glb_path, os.path.expanduser("~/Desktop/debug_model.glb"))
-        else:
-            print("No GLB file was created; skipping debug export.")
+        log.debug("temp path: %s", st.session_state.tmp_path)
+        if os.environ.get("SCANALYZER_DEBUG_GLB"):
+            import trimesh
+            vertices_np, triangles_np = _display_arrays(_mesh_digest(st.session_state.mesh))
+            trimesh.Trimesh(vertices=vertices_np, faces=triangles_np).export(
+                os.path.expanduser("~/Desktop/debug_model.glb")
+            )
 
-        if st.session_state.tmp_path and os.path.exists(st.session_state.tmp_path) and "examples" not in st.session_state.tmp_path:
+        # Content-addressed uploads (scanalyzer_<hash>) persist for the whole
+        # session so reruns can reuse them; only one-off temp files go away.
+        tmp_base = os.path.basename(st.session_state.tmp_path or "")
+        if (st.session_state.tmp_path and os.path.exists(st.session_state.tmp_path)
+                and "examples" not in st.session_state.tmp_path
+                and not tmp_base.startswith("scanalyzer_")):
             os.remove(st.session_state.tmp_path)
\ No newline at end of file
@@ -1,12 +1,39 @@
 # utils/loader.py
+import os
+
+import numpy as np
 import open3d as o3d
 
+try:
+    import trimesh
+except ImportError:
+    trimesh = None
+
+# Formats where trimesh's processed load (vertex merging, degenerate-face
+# removal) pays off: Open3D's .obj/.stl readers keep duplicate vertices per
+# face, which inflates every downstream per-vertex pass.
+_TRIMESH_EXTENSIONS = {".obj", ".stl"}
+
+
+def _load_via_trimesh(file_path):
+    tm = trimesh.load(file_path, force="mesh", process=True)
+    mesh = o3d.geometry.TriangleMesh(
+        o3d.utility.Vector3dVector(np.asarray(tm.vertices, dtype=np.float64)),
+        o3d.utility.Vector3iVector(np.asarray(tm.faces, dtype=np.int32)),
+    )
+    return mesh
+
+
 def load_3d_model(file_path):
     try:
-        mesh = o3d.io.read_triangle_mesh(file_path)
+        ext = os.path.splitext(file_path)[1].lower()
+        if trimesh is not None and ext in _TRIMESH_EXTENSIONS:
+            mesh = _load_via_trimesh(file_path)
+        else:
+            mesh = o3d.io.read_triangle_mesh(file_path)
         if not mesh.has_triangles():
             raise ValueError("File loaded but contains no triangles.")
         return mesh
     except Exception as e:
         print(f"Error loading 3D file: {e}")
-        return None
\ No newline at end of file
+        return None
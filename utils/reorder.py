@@ -0,0 +1,32 @@
+# utils/reorder.py
+import numpy as np
+
+def _interleave_bits(values):
+    # Spread the low 10 bits of each value so they occupy every third bit
+    # (standard Morton-code bit twiddling, vectorized over the array).
+    v = values.astype(np.uint32) & np.uint32(0x3FF)
+    v = (v | (v << 16)) & np.uint32(0x30000FF)
+    v = (v | (v << 8)) & np.uint32(0x300F00F)
+    v = (v | (v << 4)) & np.uint32(0x30C30C3)
+    v = (v | (v << 2)) & np.uint32(0x9249249)
+    return v
+
+def reorder_for_locality(vertices, triangles):
+    """Sort triangles along a Morton curve over their centroids.
+
+    A spatially coherent index stream keeps nearby triangles adjacent in the
+    buffer handed to the renderer, which improves GPU vertex-cache hit rates.
+    Returns the permuted triangle array; vertices are left untouched.
+    """
+    if len(triangles) == 0:
+        return triangles
+    centroids = vertices[triangles].mean(axis=1)
+    mins = centroids.min(axis=0)
+    extents = np.maximum(np.ptp(centroids, axis=0), 1e-12)
+    quantized = ((centroids - mins) / extents * 1023.0).astype(np.uint32)
+    codes = (
+        _interleave_bits(quantized[:, 0])
+        | (_interleave_bits(quantized[:, 1]) << np.uint32(1))
+        | (_interleave_bits(quantized[:, 2]) << np.uint32(2))
+    )
+    return triangles[np.argsort(codes)]